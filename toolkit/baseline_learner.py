@@ -2,6 +2,7 @@ from __future__ import (absolute_import, division, print_function, unicode_liter
 
 from .supervised_learner import SupervisedLearner
 from .matrix import Matrix
+from .column_statistics import ColumnStatistics
 
 
 class BaselineLearner(SupervisedLearner):
@@ -13,6 +14,8 @@ class BaselineLearner(SupervisedLearner):
     """
 
     labels = []
+    label_stats = None
+    incremental = True
 
     def __init__(self):
         pass
@@ -22,12 +25,28 @@ class BaselineLearner(SupervisedLearner):
         :type features: Matrix
         :type labels: Matrix
         """
+        self.label_stats = labels.stats if labels.stats else ColumnStatistics(labels)
+        self._set_labels(labels)
+
+    def update(self, features, labels):
+        """
+        :type features: Matrix
+        :type labels: Matrix
+        """
+        if self.label_stats:
+            self.label_stats = self.label_stats.add(ColumnStatistics(labels))
+        else:
+            self.label_stats = ColumnStatistics(labels)     # not trained yet, so this is the first batch
+        self._set_labels(labels)
+
+    def _set_labels(self, labels):
+        """Set the predicted labels from the label statistics"""
         self.labels = []
         for i in range(labels.cols):
             if labels.value_count(i) == 0:
-                self.labels += [labels.column_mean(i)]          # continuous
+                self.labels += [self.label_stats.mean(i)]                  # continuous
             else:
-                self.labels += [labels.most_common_value(i)]    # nominal
+                self.labels += [self.label_stats.most_common_value(i)]    # nominal
 
     def predict(self, features, labels):
         """
@@ -37,5 +56,12 @@ class BaselineLearner(SupervisedLearner):
         del labels[:]
         labels += self.labels
 
+    def predict_batch(self, features):
+        """
+        :type features: [[float]]
+        :rtype: [[float]]
+        """
+        return [list(self.labels) for _ in range(len(features))]
+
 
 
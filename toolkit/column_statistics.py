@@ -0,0 +1,126 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+from functools import reduce
+import numpy as np
+
+
+class ColumnStatistics:
+
+    """
+    Additive sufficient statistics (count, sum, min, max and, for nominal columns,
+    a histogram of values) for each column of a set of rows. Missing values are ignored.
+
+    A Matrix with a ColumnStatistics assigned to its stats attribute answers
+    column_mean, column_min, column_max and most_common_value from these statistics
+    instead of scanning its rows.
+    """
+
+    def __init__(self, matrix=None, row_start=0, row_count=None):
+        """
+        If matrix is provided, compute the statistics over row_count rows of it
+        starting at row_start (all remaining rows if row_count is None).
+        """
+        self.count = np.zeros(0)
+        self.total = np.zeros(0)
+        self.minimum = np.zeros(0)
+        self.maximum = np.zeros(0)
+        self.histograms = []    # array of dictionaries (value -> count), empty for continuous columns
+        if matrix:
+            self.compute(matrix, row_start, row_count)
+
+    def compute(self, matrix, row_start=0, row_count=None):
+        """Compute the statistics over the specified rows of a matrix"""
+        row_end = matrix.rows if row_count is None else row_start + row_count
+        a = np.array(matrix.data[row_start:row_end], dtype=float).reshape(-1, matrix.cols)
+        present = a != matrix.MISSING
+
+        self.count = present.sum(axis=0)
+        self.total = np.where(present, a, 0).sum(axis=0)
+        self.minimum = np.where(present, a, np.inf).min(axis=0, initial=np.inf)
+        self.maximum = np.where(present, a, -np.inf).max(axis=0, initial=-np.inf)
+        self.histograms = []
+        for col in range(matrix.cols):
+            histogram = {}
+            if matrix.value_count(col) > 0:
+                (vals, counts) = np.unique(a[present[:, col], col], return_counts=True)
+                histogram = dict(zip(vals.tolist(), counts.tolist()))
+            self.histograms.append(histogram)
+        return self
+
+    def add(self, other):
+        """
+        Get the statistics of these rows together with the rows of other
+        :type other: ColumnStatistics
+        :rtype: ColumnStatistics
+        """
+        result = ColumnStatistics()
+        result.count = self.count + other.count
+        result.total = self.total + other.total
+        result.minimum = np.minimum(self.minimum, other.minimum)
+        result.maximum = np.maximum(self.maximum, other.maximum)
+        result.histograms = []
+        for (mine, theirs) in zip(self.histograms, other.histograms):
+            histogram = dict(mine)
+            for (val, count) in theirs.items():
+                histogram[val] = histogram.get(val, 0) + count
+            result.histograms.append(histogram)
+        return result
+
+    def select(self, col_start, col_count):
+        """Get the statistics for a portion of the columns"""
+        result = ColumnStatistics()
+        result.count = self.count[col_start:col_start+col_count]
+        result.total = self.total[col_start:col_start+col_count]
+        result.minimum = self.minimum[col_start:col_start+col_count]
+        result.maximum = self.maximum[col_start:col_start+col_count]
+        result.histograms = self.histograms[col_start:col_start+col_count]
+        return result
+
+    def mean(self, col):
+        """Get the mean of the specified column"""
+        return self.total[col] / self.count[col] if self.count[col] > 0 else float("nan")
+
+    def min(self, col):
+        """Get the min value in the specified column"""
+        return self.minimum[col]
+
+    def max(self, col):
+        """Get the max value in the specified column"""
+        return self.maximum[col]
+
+    def most_common_value(self, col):
+        """Get the most common value in the specified (nominal) column, preferring the smallest on ties"""
+        histogram = self.histograms[col]
+        return min(histogram, key=lambda val: (-histogram[val], val))
+
+
+class FoldStatistics:
+
+    """
+    Column statistics for each fold of a cross-validation, computed with a single
+    pass over the data. The statistics of each fold's training set are combined from
+    those of the other folds, so they cost O(folds * columns) rather than a pass over
+    the training rows.
+    """
+
+    def __init__(self, matrix, folds):
+        """
+        Split the rows of matrix into the given number of contiguous folds, the same
+        way MLSystemManager does for cross-validation.
+        :type matrix: Matrix
+        :type folds: int
+        """
+        self.folds = []
+        for i in range(folds):
+            begin = int(i * matrix.rows / folds)
+            end = int((i + 1) * matrix.rows / folds)
+            self.folds.append(ColumnStatistics(matrix, begin, end - begin))
+        self.empty = ColumnStatistics(matrix, 0, 0)
+
+    def training(self, fold):
+        """
+        Get the statistics of all rows except those in the specified fold
+        :rtype: ColumnStatistics
+        """
+        remaining = self.folds[:fold] + self.folds[fold+1:]
+        return reduce(ColumnStatistics.add, remaining, self.empty)
@@ -4,6 +4,7 @@ from .supervised_learner import SupervisedLearner
 from .baseline_learner import BaselineLearner
 # from .labs import Perceptron
 from .matrix import Matrix
+from .column_statistics import FoldStatistics
 import random
 import argparse
 import time
@@ -50,7 +51,7 @@ class MLSystemManager:
 
         # load the ARFF file
         data = Matrix()
-        data.load_arff(file_name)
+        data.load_arff(file_name, sample_fraction=args.sample_fraction, sample_rows=args.sample_rows, workers=args.workers)
         if normalize:
             print("Using normalized data")
             data.normalize()
@@ -161,6 +162,10 @@ class MLSystemManager:
             elapsed_time = 0.0
             for j in range(reps):
                 data.shuffle()
+                # building the fold statistics replaces per-fold work in train, so it counts as training time
+                start_time = time.time()
+                fold_stats = FoldStatistics(data, folds)
+                elapsed_time += time.time() - start_time
                 for i in range(folds):
                     begin = int(i * data.rows / folds)
                     end = int((i + 1) * data.rows / folds)
@@ -174,6 +179,10 @@ class MLSystemManager:
                     train_features.add(data, end, 0, data.cols - 1)
                     train_labels.add(data, end, data.cols - 1, 1)
 
+                    training_stats = fold_stats.training(i)
+                    train_features.stats = training_stats.select(0, data.cols - 1)
+                    train_labels.stats = training_stats.select(data.cols - 1, 1)
+
                     start_time = time.time()
                     learner.train(train_features, train_labels)
                     elapsed_time += time.time() - start_time
@@ -186,18 +195,73 @@ class MLSystemManager:
             print("Average time to train (in seconds): {}".format(elapsed_time))
             print("Mean accuracy={}".format(sum_accuracy / (reps * folds)))
 
+        elif eval_method == "curve":
+
+            print("Calculating a learning curve on a random hold-out set...")
+            steps = int(eval_parameter)
+            if steps <= 0:
+                raise Exception("Number of steps must be greater than 0")
+            train_percent = float(args.E[2]) if len(args.E) > 2 else 0.8
+            if train_percent < 0 or train_percent > 1:
+                raise Exception("Percentage for curve evaluation must be between 0 and 1")
+            print("Number of steps: {}".format(steps))
+            print("Percentage used for training: {}".format(train_percent))
+            print("Percentage used for testing: {}".format(1 - train_percent))
+            if learner.incremental:
+                print("Training incrementally")
+
+            data.shuffle()
+
+            train_size = int(train_percent * data.rows)
+            train_features = Matrix(data, 0, 0, train_size, data.cols-1)
+            train_labels = Matrix(data, 0, data.cols-1, train_size, 1)
+
+            test_features = Matrix(data, train_size, 0, data.rows - train_size, data.cols-1)
+            test_labels = Matrix(data, train_size, data.cols-1, data.rows - train_size, 1)
+
+            # each step trains on a prefix of the training rows containing the previous step's rows
+            elapsed_time = 0.0
+            trained_size = 0
+            for i in range(steps):
+                size = int((i + 1) * train_size / steps)
+                if size == trained_size:
+                    continue
+
+                start_time = time.time()
+                if learner.incremental and trained_size > 0:
+                    learner.update(train_features.view_rows(trained_size, size - trained_size),
+                                   train_labels.view_rows(trained_size, size - trained_size))
+                else:
+                    learner.train(train_features.view_rows(0, size), train_labels.view_rows(0, size))
+                elapsed_time += time.time() - start_time
+                trained_size = size
+
+                accuracy = learner.measure_accuracy(test_features, test_labels)
+                print("Step={}, Training size={}, Accuracy={}".format(i, size, accuracy))
+
+            print("Total time to train (in seconds): {}".format(elapsed_time))
+
         else:
             raise Exception("Unrecognized evaluation method '{}'".format(eval_method))
 
+        if args.save:
+            learner.save(args.save)
+            print("Saved learner to {}".format(args.save))
+
     def parser(self):
         parser = argparse.ArgumentParser(description='Machine Learning System Manager')
 
         parser.add_argument('-V', '--verbose', action='store_true', help='Print the confusion matrix and learner accuracy on individual class values')
         parser.add_argument('-N', '--normalize', action='store_true', help='Use normalized data')
         parser.add_argument('-R', '--seed', help="Random seed") # will give a string
+        sample = parser.add_mutually_exclusive_group()
+        sample.add_argument('--sample-fraction', type=float, metavar='FRACTION', help='Load a random fraction of the rows of the ARFF file (seeded by --seed)')
+        sample.add_argument('--sample-rows', type=int, metavar='N', help='Load N random rows of the ARFF file (seeded by --seed)')
+        parser.add_argument('-J', '--workers', type=int, default=1, help='Number of processes used to parse the ARFF file')
+        parser.add_argument('-S', '--save', metavar='filename', help='Save the (last) trained learner to a file, e.g. for toolkit.scoring_server')
         parser.add_argument('-L', required=True, choices=['baseline', 'perceptron', 'neuralnet', 'decisiontree', 'knn'], help='Learning Algorithm')
         parser.add_argument('-A', '--arff', metavar='filename', required=True, help='ARFF file')
-        parser.add_argument('-E', metavar=('METHOD', 'args'), required=True, nargs='+', help="Evaluation method (training | static <test_ARFF_file> | random <%%_for_training> | cross <num_folds>)")
+        parser.add_argument('-E', metavar=('METHOD', 'args'), required=True, nargs='+', help="Evaluation method (training | static <test_ARFF_file> | random <%%_for_training> | cross <num_folds> | curve <num_steps> [<%%_for_training>])")
 
         return parser
 
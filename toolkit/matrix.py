@@ -1,6 +1,8 @@
 from __future__ import (absolute_import, division, print_function, unicode_literals)
 
 import random
+import multiprocessing
+import os
 import numpy as np
 import re
 
@@ -23,6 +25,61 @@ def mode(a, axis=0):
     return mostfrequent, oldcounts
 
 
+def _arff_data_lines(f, line_num=0):
+    """
+    Yield (line number, text) for each row in the @data section of an ARFF file
+    opened in binary mode, skipping blank lines and comments. line_num is the
+    number of lines that precede the current position of f.
+    """
+    for line in f:
+        line_num += 1
+        line = line.decode("utf-8").rstrip()
+        if len(line) > 0 and line[0] != '%':
+            yield line_num, line
+
+
+def _parse_arff_row(line, str_to_enum):
+    """Parse one row of the @data section into a list of floats"""
+    row = []
+    val_idx = 0
+    vals = line.split(",")
+    for val in vals:
+        val = val.strip()
+        if not val:
+            raise ValueError("Missing data element in row with data '{}'".format(line))
+        else:
+            row += [float(Matrix.MISSING if val == "?" else str_to_enum[val_idx].get(val, val))]
+
+        val_idx += 1
+
+    return row
+
+
+def _parse_arff_chunk(args):
+    """
+    Parse the @data rows between two newline-aligned byte offsets of an ARFF file.
+    Returns (rows, number of lines in the chunk, error), where error is None or a
+    (line number within the chunk, exception) pair for the first row that failed to parse.
+    """
+    filename, start, end, str_to_enum = args
+    with open(filename, "rb") as f:
+        f.seek(start)
+        lines = f.read(end - start).split(b"\n")
+    if lines and not lines[-1]:
+        lines.pop()
+
+    rows = []
+    for n, line in enumerate(lines):
+        line = line.decode("utf-8").rstrip()
+        if len(line) > 0 and line[0] != '%':
+            try:
+                rows += [_parse_arff_row(line, str_to_enum)]
+            except (ValueError, IndexError) as e:
+                return rows, len(lines), (n + 1, e)
+
+    return rows, len(lines), None
+
+
 class Matrix:
 
     """
@@ -40,6 +97,7 @@ class Matrix:
     str_to_enum = []       # array of dictionaries
     enum_to_str = []       # array of dictionaries
     dataset_name = "Untitled"
+    stats = None           # optional ColumnStatistics describing the rows of this matrix
     MISSING = float("infinity")
 
     def __init__(self, matrix=None, row_start=None, col_start=None, row_count=None, col_count=None, arff=None):
@@ -60,17 +118,31 @@ class Matrix:
         self.enum_to_str = matrix.enum_to_str[col_start:col_start+col_count]    # array of dictionaries
         return self
 
+    def view_rows(self, row_start, row_count):
+        """
+        Get a matrix of the specified rows that shares its row lists and attribute
+        definitions with this matrix rather than copying them
+        """
+        view = Matrix()
+        view.data = self.data[row_start:row_start+row_count]
+        view.attr_names = self.attr_names
+        view.str_to_enum = self.str_to_enum
+        view.enum_to_str = self.enum_to_str
+        view.dataset_name = self.dataset_name
+        return view
+
     def add(self, matrix, row_start, col_start, col_count):
         """Appends a copy of the specified portion of a matrix to this matrix"""
         if __debug__ and self.cols < col_count:
             raise Exception("out of range")
 
         if __debug__:
-            for col in range(self.num_attributes):
-                if matrix.is_continuous(col_start + col) != self.is_continuous(col):
+            for col in range(self.cols):
+                if matrix.value_count(col_start + col) != self.value_count(col):
                     raise Exception("incompatible relations")
 
-        for i in range(matrix.size - row_start):
+        self.stats = None
+        for i in range(matrix.rows - row_start):
             self.data.append(matrix.data[row_start + i][col_start:col_start + col_count])
 
     def set_size(self, rows, cols):
@@ -79,78 +151,151 @@ class Matrix:
         self.attr_names = [""] * cols
         self.str_to_enum = {}
         self.enum_to_str = {}
+        self.stats = None
+
+    def load_arff(self, filename, sample_fraction=None, sample_rows=None, workers=1):
+        """
+        Load matrix from an ARFF file
+
+        If sample_fraction is provided, each row of the @data section is kept with that
+        probability (Bernoulli sampling). If sample_rows is provided, a uniform random sample
+        of exactly that many rows is kept (reservoir sampling). Only the kept rows are parsed,
+        and they keep their original file order. Sampling draws from the random module, so
+        call random.seed() first for repeatable samples.
+
+        If workers is greater than 1, the @data section is split into that many chunks (at most
+        one per CPU) which are parsed in separate processes. The result is identical to loading
+        serially.
+        """
+        if sample_fraction is not None and sample_rows is not None:
+            raise Exception("Only one of sample_fraction and sample_rows may be provided")
+        if sample_fraction is not None and not 0 < sample_fraction <= 1:
+            raise Exception("Sample fraction must be greater than 0 and at most 1")
+        if sample_rows is not None and sample_rows < 0:
+            raise Exception("Number of sample rows must not be negative")
+        if workers > 1 and (sample_fraction is not None or sample_rows is not None):
+            raise Exception("Sampling is not supported when loading with multiple workers")
 
-    def load_arff(self, filename):
-        """Load matrix from an ARFF file"""
         self.data = []
         self.attr_names = []
         self.str_to_enum = []
         self.enum_to_str = []
-        reading_data = False
-
-        rows = []           # we read data into array of rows, then convert into array of columns
-
-        f = open(filename)
-        for line in f.readlines():
-            line = line.rstrip()
+        self.stats = None
+
+        with open(filename, "rb") as f:
+            line_num = self._read_arff_header(f)
+            if min(workers, multiprocessing.cpu_count()) > 1:
+                self.data = self._load_arff_data_parallel(f, line_num, min(workers, multiprocessing.cpu_count()))
+                return
+
+            lines = _arff_data_lines(f, line_num)
+
+            if sample_fraction is not None:
+                lines = [(n, line) for (n, line) in lines if random.random() < sample_fraction]
+            elif sample_rows is not None:
+                reservoir = []
+                for i, item in enumerate(lines):
+                    if i < sample_rows:
+                        reservoir.append(item)
+                    else:
+                        j = random.randint(0, i)
+                        if j < sample_rows:
+                            reservoir[j] = item
+                lines = sorted(reservoir)
+
+            rows = []
+            for n, line in lines:
+                try:
+                    rows += [_parse_arff_row(line, self.str_to_enum)]
+                except (ValueError, IndexError) as e:
+                    raise type(e)("{} (line {})".format(e, n))
+
+        self.data = rows
+
+    def _read_arff_header(self, f):
+        """
+        Read the attribute definitions from an ARFF file opened in binary mode, stopping
+        just after the @data line. Returns the number of lines read.
+        """
+        line_num = 0
+        while True:
+            line = f.readline()
+            if not line:
+                return line_num
+            line_num += 1
+            line = line.decode("utf-8").rstrip()
             if len(line) > 0 and line[0] != '%':
-                if not reading_data:
-                    if line.lower().startswith("@relation"):
-                        self.dataset_name = line[9:].strip()
-                    elif line.lower().startswith("@attribute"):
-                        attr_def = line[10:].strip()
-                        if attr_def[0] == "'":
-                            attr_def = attr_def[1:]
-                            attr_name = attr_def[:attr_def.index("'")]
-                            attr_def = attr_def[attr_def.index("'")+1:].strip()
-                        else:
-                            search = re.search(r'(\w*)\s*(.*)', attr_def)
-                            attr_name = search.group(1)
-                            attr_def = search.group(2)
-                            # Remove white space from atribute values
-                            attr_def = "".join(attr_def.split())
-
-                        self.attr_names += [attr_name]
-
-                        str_to_enum = {}
-                        enum_to_str = {}
-                        if not(attr_def.lower() == "real" or attr_def.lower() == "continuous" or attr_def.lower() == "integer"):
-                            # attribute is discrete
-                            assert attr_def[0] == '{' and attr_def[-1] == '}'
-                            attr_def = attr_def[1:-1]
-                            attr_vals = attr_def.split(",")
-                            val_idx = 0
-                            for val in attr_vals:
-                                val = val.strip()
-                                enum_to_str[val_idx] = val
-                                str_to_enum[val] = val_idx
-                                val_idx += 1
-
-                        self.enum_to_str.append(enum_to_str)
-                        self.str_to_enum.append(str_to_enum)
-
-                    elif line.lower().startswith("@data"):
-                        reading_data = True
-
-                else:
-                    # reading data
-                    row = []
-                    val_idx = 0
-                    # print("{}".format(line))
-                    vals = line.split(",")
-                    for val in vals:
-                        val = val.strip()
-                        if not val:
-                            raise Exception("Missing data element in row with data '{}'".format(line))
-                        else:
-                            row += [float(self.MISSING if val == "?" else self.str_to_enum[val_idx].get(val, val))]
-
-                        val_idx += 1
-
-                    rows += [row]
-
-        f.close()
-        self.data=rows
+                if line.lower().startswith("@relation"):
+                    self.dataset_name = line[9:].strip()
+                elif line.lower().startswith("@attribute"):
+                    attr_def = line[10:].strip()
+                    if attr_def[0] == "'":
+                        attr_def = attr_def[1:]
+                        attr_name = attr_def[:attr_def.index("'")]
+                        attr_def = attr_def[attr_def.index("'")+1:].strip()
+                    else:
+                        search = re.search(r'(\w*)\s*(.*)', attr_def)
+                        attr_name = search.group(1)
+                        attr_def = search.group(2)
+                        # Remove white space from atribute values
+                        attr_def = "".join(attr_def.split())
+
+                    self.attr_names += [attr_name]
+
+                    str_to_enum = {}
+                    enum_to_str = {}
+                    if not(attr_def.lower() == "real" or attr_def.lower() == "continuous" or attr_def.lower() == "integer"):
+                        # attribute is discrete
+                        assert attr_def[0] == '{' and attr_def[-1] == '}'
+                        attr_def = attr_def[1:-1]
+                        attr_vals = attr_def.split(",")
+                        val_idx = 0
+                        for val in attr_vals:
+                            val = val.strip()
+                            enum_to_str[val_idx] = val
+                            str_to_enum[val] = val_idx
+                            val_idx += 1
+
+                    self.enum_to_str.append(enum_to_str)
+                    self.str_to_enum.append(str_to_enum)
+
+                elif line.lower().startswith("@data"):
+                    return line_num
+
+    def _load_arff_data_parallel(self, f, line_num, workers):
+        """
+        Parse the rest of an ARFF file (positioned just after the @data line, with line_num
+        lines already read) using a pool of worker processes. Returns the rows in file order.
+        """
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+
+        # split the @data section into chunks that begin at the start of a line
+        bounds = [start]
+        for i in range(1, workers):
+            f.seek(start + (size - start) * i // workers)
+            f.readline()
+            bounds += [max(bounds[-1], f.tell())]
+        bounds += [size]
+        chunks = [(f.name, bounds[i], bounds[i+1], self.str_to_enum)
+                  for i in range(workers) if bounds[i] < bounds[i+1]]
+
+        pool = multiprocessing.Pool(workers)
+        try:
+            results = pool.map(_parse_arff_chunk, chunks)
+        finally:
+            pool.close()
+            pool.join()
+
+        rows = []
+        for chunk_rows, chunk_lines, error in results:
+            if error:
+                (n, e) = error
+                raise type(e)("{} (line {})".format(e, line_num + n))
+            rows += chunk_rows
+            line_num += chunk_lines
+
+        return rows
 
     @property
     def rows(self):
@@ -180,6 +325,7 @@ class Matrix:
     def set(self, row, col, val):
         """Set the value at the specified row and column"""
         self.data[row][col] = val
+        self.stats = None
 
     def attr_name(self, col):
         """Get the name of the specified attribute"""
@@ -216,32 +362,41 @@ class Matrix:
 
     def column_mean(self, col):
         """Get the mean of the specified column"""
-
+        if self.stats:
+            return self.stats.mean(col)
         a = np.ma.masked_equal(self.col(col), self.MISSING).compressed()
         return np.mean(a)
 
     def column_min(self, col):
         """Get the min value in the specified column"""
+        if self.stats:
+            return self.stats.min(col)
         a = np.ma.masked_equal(self.col(col), self.MISSING).compressed()
         return np.min(a)
 
     def column_max(self, col):
         """Get the max value in the specified column"""
+        if self.stats:
+            return self.stats.max(col)
         a = np.ma.masked_equal(self.col(col), self.MISSING).compressed()
         return np.max(a)
 
     def most_common_value(self, col):
         """Get the most common value in the specified column"""
+        if self.stats and self.value_count(col) > 0:
+            return self.stats.most_common_value(col)
         a = np.ma.masked_equal(self.col(col), self.MISSING).compressed()
         (val, count) = mode(a)
         return val[0]
 
     def normalize(self):
         """Normalize each column of continuous values"""
+        # look up every range before any value changes, so they can all come from self.stats
+        ranges = [(self.column_min(i), self.column_max(i)) if self.value_count(i) == 0 else None
+                  for i in range(self.cols)]
         for i in range(self.cols):
-            if self.value_count(i) == 0:     # is continuous
-                min_val = self.column_min(i)
-                max_val = self.column_max(i)
+            if ranges[i]:     # is continuous
+                (min_val, max_val) = ranges[i]
                 for j in range(self.rows):
                     v = self.get(j, i)
                     if v != self.MISSING:
@@ -0,0 +1,203 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+import argparse
+import asyncio
+import collections
+import json
+import time
+import numpy as np
+
+
+class ScoringServer:
+
+    """
+    Serves predictions from a trained learner over a local TCP socket. Requires Python 3.7+.
+
+    The protocol is newline-delimited JSON. A request of {"row": [feature values]} is
+    answered with {"labels": [label values]}, and {"metrics": true} is answered with the
+    current throughput and latency metrics. Malformed requests are answered with
+    {"error": message}.
+
+    Rows from concurrent requests are collected into micro-batches and scored with a
+    single call to learner.predict_batch(). A batch is scored as soon as it holds
+    max_batch_size rows or its first row has waited max_delay seconds.
+    """
+
+    def __init__(self, learner, max_batch_size=64, max_delay=0.005):
+        """
+        :type learner: SupervisedLearner
+        :type max_batch_size: int
+        :type max_delay: float
+        """
+        self.learner = learner
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        self.request_count = 0
+        self.batch_count = 0
+        self.latencies = collections.deque(maxlen=10000)     # seconds, most recent requests
+        self.start_time = time.time()
+
+        self._queue = None
+        self._batcher = None
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        """Start listening. Returns the (host, port) the server is bound to."""
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batcher())
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self.start_time = time.time()
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """Stop accepting connections and stop scoring"""
+        self._server.close()
+        await self._server.wait_closed()
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+
+    async def serve_forever(self, host="127.0.0.1", port=8478):
+        """Start listening and serve until cancelled"""
+        (host, port) = await self.start(host, port)
+        print("Scoring server listening on {}:{}".format(host, port))
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def predict(self, row):
+        """
+        Queue a feature vector for the next batch and wait for its label vector
+        :type row: [float]
+        :rtype: [float]
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future, time.time()))
+        return await future
+
+    def metrics(self):
+        """Get throughput and latency metrics for the requests served so far"""
+        elapsed = time.time() - self.start_time
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "requests": self.request_count,
+            "batches": self.batch_count,
+            "mean_batch_size": self.request_count / self.batch_count if self.batch_count else 0.0,
+            "throughput": self.request_count / elapsed if elapsed > 0 else 0.0,      # requests per second
+            "latency_ms_mean": float(np.mean(latencies)),
+            "latency_ms_p50": float(np.percentile(latencies, 50)),
+            "latency_ms_p99": float(np.percentile(latencies, 99)),
+        }
+
+    async def _run_batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                self._score(batch)
+            except Exception as e:
+                for (_, future, _) in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _score(self, batch):
+        try:
+            predictions = self.learner.predict_batch(np.array([row for (row, _, _) in batch], dtype=float))
+            if len(predictions) != len(batch):
+                raise ValueError("predict_batch returned {} predictions for {} rows".format(len(predictions), len(batch)))
+        except Exception:
+            if len(batch) == 1:
+                raise
+            # score the rows one at a time, so a bad row only fails its own request
+            for item in batch:
+                try:
+                    self._score([item])
+                except Exception as e:
+                    if not item[1].done():
+                        item[1].set_exception(e)
+            return
+
+        now = time.time()
+        self.batch_count += 1
+        for ((_, future, queued), labels) in zip(batch, predictions):
+            self.request_count += 1
+            self.latencies.append(now - queued)
+            if not future.done():
+                future.set_result([float(label) for label in labels])
+
+    async def _handle_client(self, reader, writer):
+        # each request is answered by its own task, so rows sent back to back on one
+        # connection can share a batch; answers are still written in request order
+        responses = asyncio.Queue()
+        writer_task = asyncio.ensure_future(self._write_responses(responses, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await responses.put(asyncio.ensure_future(self._respond(line)))
+            await responses.put(None)
+            await writer_task
+        finally:
+            # if the connection failed, stop answering requests nobody will read
+            writer_task.cancel()
+            while not responses.empty():
+                task = responses.get_nowait()
+                if task is not None:
+                    task.cancel()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, line):
+        try:
+            request = json.loads(line.decode("utf-8"))
+            if not isinstance(request, dict):
+                raise ValueError("Expected a JSON object")
+            if request.get("metrics"):
+                return self.metrics()
+            if "row" not in request:
+                raise ValueError("Expected a 'row' or 'metrics' request")
+            return {"labels": await self.predict([float(val) for val in request["row"]])}
+        except Exception as e:
+            return {"error": "{}".format(e)}
+
+    async def _write_responses(self, responses, writer):
+        while True:
+            task = await responses.get()
+            if task is None:
+                return
+            writer.write(json.dumps(await task).encode("utf-8") + b"\n")
+            await writer.drain()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve predictions from a learner saved with --save')
+    parser.add_argument('learner', metavar='filename', help='Saved learner')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8478, help='Port to listen on')
+    parser.add_argument('--max-batch-size', type=int, default=64, help='Maximum number of rows scored together')
+    parser.add_argument('--max-delay', type=float, default=0.005, help='Maximum time (in seconds) a row waits for its batch to fill')
+    args = parser.parse_args()
+
+    from .supervised_learner import SupervisedLearner     # imported here so this module also loads outside the package
+    learner = SupervisedLearner.load(args.learner)
+    server = ScoringServer(learner, args.max_batch_size, args.max_delay)
+    asyncio.run(server.serve_forever(args.host, args.port))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,12 +2,15 @@ from __future__ import (absolute_import, division, print_function, unicode_liter
 
 from .matrix import Matrix
 import math
+import pickle
 
 # this is an abstract class
 
 
 class SupervisedLearner:
 
+    incremental = False     # True if update() is implemented
+
     def train(self, features, labels):
         """
         Before you call this method, you need to divide your data
@@ -17,6 +20,16 @@ class SupervisedLearner:
         """
         raise NotImplementedError()
 
+    def update(self, features, labels):
+        """
+        Continue training a trained learner on additional rows, as if train had been
+        called with all of the rows seen so far. Learners that implement this should
+        also set incremental to True.
+        :type features: Matrix
+        :type labels: Matrix
+        """
+        raise NotImplementedError()
+
     def predict(self, features, labels):
         """
         A feature vector goes in. A label vector comes out. (Some supervised
@@ -27,6 +40,35 @@ class SupervisedLearner:
         """
         raise NotImplementedError
 
+    def predict_batch(self, features):
+        """
+        Predict the label vectors for many feature vectors at once. Learners that can
+        vectorize their predictions should override this; by default it calls predict
+        once per row.
+        :type features: [[float]]
+        :rtype: [[float]]
+        """
+        predictions = []
+        for feat in features:
+            labels = []
+            self.predict(feat, labels)
+            predictions.append(labels)
+        return predictions
+
+    def save(self, filename):
+        """Persist the trained learner to a file"""
+        with open(filename, "wb") as f:
+            pickle.dump(self, f, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def load(filename):
+        """
+        Load a learner persisted with save()
+        :rtype: SupervisedLearner
+        """
+        with open(filename, "rb") as f:
+            return pickle.load(f)
+
     def measure_accuracy(self, features, labels, confusion=None):
         """
         The model must be trained before you call this method. If the label is nominal,
@@ -46,16 +88,15 @@ class SupervisedLearner:
         if features.rows == 0:
             raise Exception("Expected at least one row")
 
+        predictions = self.predict_batch(features.data)
+
         label_values_count = labels.value_count(0)
         if label_values_count == 0:
             # label is continuous
-            pred = []
             sse = 0.0
             for i in range(features.rows):
-                feat = features.row(i)
                 targ = labels.row(i)
-                pred.clear()      # make sure the prediction is not biased by a previous prediction
-                self.predict(feat, pred)
+                pred = predictions[i]
                 delta = targ[0] - pred[0]
                 sse += delta**2
             return math.sqrt(sse / features.rows)
@@ -67,14 +108,11 @@ class SupervisedLearner:
                 confusion.attr_names = [labels.attr_value(0, i) for i in range(label_values_count)]
 
             correct_count = 0
-            prediction = []
             for i in range(features.rows):
-                feat = features.row(i)
                 targ = int(labels.get(i, 0))
                 if targ >= label_values_count:
                     raise Exception("The label is out of range")
-                self.predict(feat, prediction)
-                pred = int(prediction[0])
+                pred = int(predictions[i][0])
                 if confusion:
                     confusion.set(targ, pred, confusion.get(targ, pred)+1)
                 if pred == targ:
@@ -0,0 +1,78 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+from unittest import TestCase,TestLoader,TextTestRunner
+from column_statistics import ColumnStatistics, FoldStatistics
+from matrix import Matrix
+
+
+class TestColumnStatistics(TestCase):
+
+    infinity = float("infinity")
+
+    def setUp(self):
+        m = Matrix()
+        m.attr_names = ['A', 'B', 'C']
+        m.str_to_enum = [{}, {}, {'R': 0, 'G': 1, 'B': 2}]
+        m.enum_to_str = [{}, {}, {0: 'R', 1: 'G', 2: 'B'}]
+        m.data = [[1.5, -6.0, 1.0],
+                  [2.3, -8.0, 2.0],
+                  [4.1, self.infinity, 2.0],
+                  [0.7, 3.0, 0.0],
+                  [2.9, -1.0, 1.0],
+                  [5.0, 4.0, 1.0],
+                  [3.3, self.infinity, 2.0]]
+        self.m = m
+
+    def test_statistics(self):
+        s = ColumnStatistics(self.m)
+        for col in range(2):
+            self.assertAlmostEqual(s.mean(col), self.m.column_mean(col))
+            self.assertEqual(s.min(col), self.m.column_min(col))
+            self.assertEqual(s.max(col), self.m.column_max(col))
+        self.assertEqual(s.most_common_value(2), self.m.most_common_value(2))
+
+    def test_training(self):
+        folds = 3
+        fold_stats = FoldStatistics(self.m, folds)
+        for i in range(folds):
+            begin = int(i * self.m.rows / folds)
+            end = int((i + 1) * self.m.rows / folds)
+            train = Matrix(self.m, 0, 0, begin, self.m.cols)
+            train.add(self.m, end, 0, self.m.cols)
+
+            s = fold_stats.training(i)
+            for col in range(2):
+                self.assertAlmostEqual(s.mean(col), train.column_mean(col))
+                self.assertEqual(s.min(col), train.column_min(col))
+                self.assertEqual(s.max(col), train.column_max(col))
+            self.assertEqual(s.most_common_value(2), train.most_common_value(2))
+
+    def test_training_precision(self):
+        m = Matrix()
+        m.attr_names = ['A']
+        m.str_to_enum = [{}]
+        m.enum_to_str = [{}]
+        m.data = [[1e16]] + [[(i % 100) / 100.0] for i in range(999)]
+
+        # the 1e16 row is in the held-out fold, so it must not affect the training mean
+        train = Matrix(m, 100, 0, m.rows - 100, 1)
+        s = FoldStatistics(m, 10).training(0)
+        self.assertAlmostEqual(s.mean(0), train.column_mean(0))
+
+    def test_single_fold(self):
+        s = FoldStatistics(self.m, 1).training(0)
+        self.assertEqual(s.count[0], 0)
+        self.assertListEqual(s.histograms, [{}, {}, {}])
+
+    def test_matrix_stats(self):
+        labels = Matrix(self.m, 0, 2, self.m.rows, 1)
+        labels.stats = ColumnStatistics(self.m).select(2, 1)
+        labels.stats.histograms[0][0.0] = 10
+        self.assertEqual(labels.most_common_value(0), 0.0)
+
+        labels.set(0, 0, 2.0)
+        self.assertIsNone(labels.stats)
+        self.assertEqual(labels.most_common_value(0), 2.0)
+
+# suite = TestLoader().loadTestsFromTestCase(TestColumnStatistics)
+# TextTestRunner(verbosity=2).run(suite)
@@ -0,0 +1,89 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+from unittest import TestCase,TestLoader,TextTestRunner
+from unittest import mock
+from toolkit.baseline_learner import BaselineLearner
+from toolkit.manager import MLSystemManager
+from toolkit.matrix import Matrix
+import io
+import os
+import re
+import tempfile
+
+
+class TestLearningCurve(TestCase):
+
+    def setUp(self):
+        # column 0 is continuous, column 1 nominal
+        m = Matrix()
+        m.attr_names = ['x', 'color']
+        m.str_to_enum = [{}, {'R': 0, 'G': 1, 'B': 2}]
+        m.enum_to_str = [{}, {0: 'R', 1: 'G', 2: 'B'}]
+        m.data = [[(i * 7 % 11) / 3.0, float(i * i % 5 % 3)] for i in range(40)]
+        self.m = m
+
+    def test_update(self):
+        for col in range(2):
+            labels = Matrix(self.m, 0, col, self.m.rows, 1)
+            incremental = BaselineLearner()
+            trained = 0
+            for size in [3, 10, 11, 25, 40]:
+                if trained == 0:
+                    incremental.train(Matrix(), labels.view_rows(0, size))
+                else:
+                    incremental.update(Matrix(), labels.view_rows(trained, size - trained))
+                trained = size
+
+                full = BaselineLearner()
+                full.train(Matrix(), labels.view_rows(0, size))
+                self.assertEqual(len(incremental.labels), 1)
+                self.assertAlmostEqual(incremental.labels[0], full.labels[0])
+
+    def test_update_before_train(self):
+        labels = Matrix(self.m, 0, 1, self.m.rows, 1)
+        first = BaselineLearner()
+        first.update(Matrix(), labels)
+        full = BaselineLearner()
+        full.train(Matrix(), labels)
+        self.assertListEqual(first.labels, full.labels)
+
+    def test_measure_accuracy(self):
+        features = Matrix(self.m, 0, 0, self.m.rows, 1)
+        labels = Matrix(self.m, 0, 1, self.m.rows, 1)
+        l = BaselineLearner()
+        l.train(features, labels)
+        expected = labels.col(0).count(l.labels[0]) / labels.rows
+        with mock.patch.object(l, "predict", side_effect=AssertionError("predict called")):
+            self.assertAlmostEqual(l.measure_accuracy(features, labels), expected)
+
+    def run_curve(self, steps):
+        """Run the manager's curve evaluation on self.m and return (training size, accuracy) per step"""
+        f, arff = tempfile.mkstemp(suffix=".arff")
+        with os.fdopen(f, "w") as f:
+            f.write("@RELATION test\n@ATTRIBUTE x REAL\n@ATTRIBUTE color {R, G, B}\n@DATA\n")
+            for row in self.m.data:
+                f.write("{}, {}\n".format(row[0], self.m.enum_to_str[1][row[1]]))
+        try:
+            argv = ["manager", "-L", "baseline", "-A", arff, "-E", "curve", str(steps), "0.75", "-R", "1"]
+            with mock.patch("sys.argv", argv), mock.patch("sys.stdout", new_callable=io.StringIO) as out:
+                MLSystemManager().main()
+        finally:
+            os.remove(arff)
+        return [(int(size), float(accuracy))
+                for (size, accuracy) in re.findall(r"Training size=(\d+), Accuracy=(\S+)", out.getvalue())]
+
+    def test_curve(self):
+        curve = self.run_curve(4)
+        self.assertListEqual([size for (size, _) in curve], [7, 15, 22, 30])
+
+        # retraining from scratch at every step gives the same curve
+        with mock.patch.object(BaselineLearner, "incremental", False):
+            self.assertListEqual(self.run_curve(4), curve)
+
+        # after the first step, only the new rows are passed to update
+        with mock.patch.object(BaselineLearner, "update", autospec=True, side_effect=BaselineLearner.update) as update:
+            self.assertListEqual(self.run_curve(4), curve)
+        self.assertListEqual([call[0][2].rows for call in update.call_args_list], [8, 7, 8])
+
+# suite = TestLoader().loadTestsFromTestCase(TestLearningCurve)
+# TextTestRunner(verbosity=2).run(suite)
@@ -2,6 +2,10 @@ from __future__ import (absolute_import, division, print_function, unicode_liter
 
 from unittest import TestCase,TestLoader,TextTestRunner
 from matrix import Matrix
+from unittest import mock
+import os
+import random
+import tempfile
 
 
 class TestMatrix(TestCase):
@@ -32,11 +36,31 @@ class TestMatrix(TestCase):
                    [0.4, 1.4, 2.4, 3.4, 2.0]]
         self.m2 = m2
 
+        f, self.arff = tempfile.mkstemp(suffix=".arff")
+        with os.fdopen(f, "w") as f:
+            f.write("@RELATION test\n"
+                    "@ATTRIBUTE x REAL\n"
+                    "@ATTRIBUTE color {R, G, B}\n"
+                    "@DATA\n")
+            for i in range(100):
+                f.write("{}, {}\n".format(i, "RGB"[i % 3]))
+
+    def tearDown(self):
+        os.remove(self.arff)
+
     def test_init_from(self):
         m2 = Matrix(self.m, 1, 1, 2, 2)
         self.assertListEqual(m2.get(0), [-8, 2])
         self.assertListEqual(m2.get(1), [self.infinity, 2])
 
+    def test_view_rows(self):
+        v = self.m2.view_rows(1, 3)
+        self.assertEqual(v.rows, 3)
+        self.assertEqual(v.cols, 5)
+        self.assertListEqual(v.row(0), self.m2.row(1))
+        self.assertIs(v.row(2), self.m2.row(3))
+        self.assertEqual(v.most_common_value(4), 1.0)
+
     def test_add(self):
         self.m.add(self.m2, 0, 2, 3)
         self.m.print()
@@ -116,5 +140,67 @@ class TestMatrix(TestCase):
         self.assertEquals(self.m.most_common_value(0), 1.5)
         self.assertEquals(self.m.most_common_value(2), 2)
 
+    def test_load_arff_sample_fraction(self):
+        random.seed(0)
+        t = Matrix()
+        t.load_arff(self.arff, sample_fraction=0.3)
+        self.assertTrue(0 < t.rows < 100)
+        xs = t.col(0)
+        self.assertListEqual(xs, sorted(xs))
+        for row in t.data:
+            self.assertEqual(row[1], row[0] % 3)
+
+    def test_load_arff_sample_rows(self):
+        random.seed(0)
+        t = Matrix()
+        t.load_arff(self.arff, sample_rows=10)
+        self.assertEqual(t.rows, 10)
+        xs = t.col(0)
+        self.assertListEqual(xs, sorted(xs))
+        self.assertEqual(len(set(xs)), 10)
+
+        t.load_arff(self.arff, sample_rows=1000)
+        self.assertEqual(t.rows, 100)
+
+    def test_load_arff_error(self):
+        with open(self.arff, "a") as f:
+            f.write("100, Y\n")
+        with self.assertRaises(ValueError) as cm:
+            Matrix().load_arff(self.arff)
+        self.assertIn("(line 105)", str(cm.exception))
+
+    @mock.patch("multiprocessing.cpu_count", return_value=8)
+    def test_load_arff_workers(self, cpu_count):
+        serial = Matrix()
+        serial.load_arff(self.arff)
+        for workers in [2, 3, 7]:
+            t = Matrix()
+            t.load_arff(self.arff, workers=workers)
+            self.assertListEqual(t.data, serial.data)
+            self.assertListEqual(t.str_to_enum, serial.str_to_enum)
+
+        with open(self.arff, "a") as f:
+            f.write("100, Y\n101, R\n")
+        with self.assertRaises(ValueError) as cm:
+            Matrix().load_arff(self.arff, workers=4)
+        self.assertIn("(line 105)", str(cm.exception))
+
+    @mock.patch("multiprocessing.cpu_count", return_value=8)
+    def test_load_arff_long_row(self, cpu_count):
+        with open(self.arff, "a") as f:
+            f.write("100, R, 7\n")
+        for workers in [1, 4]:
+            with self.assertRaises(IndexError) as cm:
+                Matrix().load_arff(self.arff, workers=workers)
+            self.assertIn("(line 105)", str(cm.exception))
+
+    @mock.patch("multiprocessing.cpu_count", return_value=1)
+    def test_load_arff_workers_capped(self, cpu_count):
+        with mock.patch("multiprocessing.Pool") as pool:
+            t = Matrix()
+            t.load_arff(self.arff, workers=4)
+        self.assertFalse(pool.called)
+        self.assertEqual(t.rows, 100)
+
 # suite = TestLoader().loadTestsFromTestCase(TestMatrix)
 # TextTestRunner(verbosity=2).run(suite)
\ No newline at end of file
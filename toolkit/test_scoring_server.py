@@ -0,0 +1,107 @@
+from __future__ import (absolute_import, division, print_function, unicode_literals)
+
+from unittest import TestCase,TestLoader,TextTestRunner
+from scoring_server import ScoringServer
+import asyncio
+import json
+
+
+class SumLearner:
+    """Predicts the sum of the features, and records the size of each batch"""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_batch(self, features):
+        self.batch_sizes.append(len(features))
+        return [[sum(row)] for row in features]
+
+
+class ShortLearner(SumLearner):
+    """Drops the last prediction of every batch"""
+
+    def predict_batch(self, features):
+        return SumLearner.predict_batch(self, features)[:-1]
+
+
+class TestScoringServer(TestCase):
+
+    def request(self, requests, max_batch_size=64, max_delay=0.05, learner=None):
+        """
+        Send requests over one connection to a local server, then ask for its metrics.
+        Returns the responses, the learner and the metrics.
+        """
+        learner = learner if learner else SumLearner()
+        server = ScoringServer(learner, max_batch_size, max_delay)
+
+        async def run():
+            (host, port) = await server.start()
+            reader, writer = await asyncio.open_connection(host, port)
+            for request in requests:
+                writer.write(request.encode("utf-8") + b"\n")
+            await writer.drain()
+            responses = [json.loads((await reader.readline()).decode("utf-8")) for _ in requests]
+            writer.write(b'{"metrics": true}\n')
+            metrics = json.loads((await reader.readline()).decode("utf-8"))
+            writer.close()
+            await server.close()
+            return responses, metrics
+
+        responses, metrics = asyncio.run(asyncio.wait_for(run(), 10))
+        return responses, learner, metrics
+
+    def test_predict(self):
+        requests = [json.dumps({"row": [i, 1.5]}) for i in range(10)]
+        responses, learner, metrics = self.request(requests)
+        self.assertListEqual([r["labels"] for r in responses], [[i + 1.5] for i in range(10)])
+        self.assertEqual(sum(learner.batch_sizes), 10)
+        self.assertLess(len(learner.batch_sizes), 10)
+
+    def test_max_batch_size(self):
+        requests = [json.dumps({"row": [i]}) for i in range(10)]
+        responses, learner, metrics = self.request(requests, max_batch_size=4)
+        self.assertTrue(all(size <= 4 for size in learner.batch_sizes))
+
+    def test_metrics(self):
+        requests = [json.dumps({"row": [i]}) for i in range(5)]
+        responses, learner, metrics = self.request(requests)
+        self.assertEqual(metrics["requests"], 5)
+        self.assertEqual(metrics["batches"], len(learner.batch_sizes))
+        self.assertGreaterEqual(metrics["latency_ms_p99"], metrics["latency_ms_p50"])
+
+    def test_errors(self):
+        requests = ["not json", json.dumps([1, 2]), json.dumps({"row": [1, 2]}), json.dumps({"row": [1]})]
+        responses, learner, metrics = self.request(requests)
+        self.assertIn("error", responses[0])
+        self.assertIn("error", responses[1])
+        self.assertListEqual(responses[2]["labels"], [3.0])
+        self.assertListEqual(responses[3]["labels"], [1.0])
+
+    def test_short_predictions(self):
+        requests = [json.dumps({"row": [i]}) for i in range(5)]
+        responses, learner, metrics = self.request(requests, learner=ShortLearner())
+        self.assertTrue(all("error" in r for r in responses))
+        self.assertEqual(metrics["requests"], 0)
+
+    def test_client_disconnect(self):
+        server = ScoringServer(SumLearner(), max_delay=0.05)
+
+        async def run():
+            (host, port) = await server.start()
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(json.dumps({"row": [1]}).encode("utf-8") + b"\n")
+            await writer.drain()
+            writer.transport.abort()
+            await asyncio.sleep(0.2)
+            # the server keeps serving other clients
+            reader, writer = await asyncio.open_connection(host, port)
+            writer.write(json.dumps({"row": [2]}).encode("utf-8") + b"\n")
+            response = json.loads((await reader.readline()).decode("utf-8"))
+            writer.close()
+            await server.close()
+            return response
+
+        self.assertListEqual(asyncio.run(asyncio.wait_for(run(), 10))["labels"], [2.0])
+
+# suite = TestLoader().loadTestsFromTestCase(TestScoringServer)
+# TextTestRunner(verbosity=2).run(suite)